@@ -21,4 +21,33 @@ class Brain:
         z3 = np.dot(a2, self.w3) + self.b3
         a3 = np.tanh(z3)
         
-        return a3
\ No newline at end of file
+        return a3
+
+    def to_array(self) -> np.ndarray:
+        return np.concatenate([m.ravel() for m in (self.w1, self.b1, self.w2, self.b2, self.w3, self.b3)])
+
+    @classmethod
+    def from_array(cls, flat: np.ndarray, input_size: int, hidden_size: int, output_size: int) -> "Brain":
+        brain = cls.__new__(cls)
+        shapes = [
+            (input_size, hidden_size), (hidden_size,),
+            (hidden_size, hidden_size), (hidden_size,),
+            (hidden_size, output_size), (output_size,)
+        ]
+
+        mats, offset = [], 0
+        for shape in shapes:
+            size = int(np.prod(shape))
+            mats.append(np.array(flat[offset:offset + size], dtype='float64').reshape(shape))
+            offset += size
+        if offset != len(flat):
+            raise ValueError(f"Genome di dimensione {len(flat)}, attesi {offset} pesi")
+
+        brain.w1, brain.b1, brain.w2, brain.b2, brain.w3, brain.b3 = mats
+        return brain
+
+    @staticmethod
+    def genome_size(input_size: int, hidden_size: int, output_size: int) -> int:
+        return (input_size * hidden_size + hidden_size
+                + hidden_size * hidden_size + hidden_size
+                + hidden_size * output_size + output_size)
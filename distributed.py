@@ -0,0 +1,370 @@
+import os
+import json
+import time
+import queue
+import random
+import socket
+import struct
+import argparse
+import threading
+import multiprocessing
+import numpy as np
+from typing import List, Dict, Tuple
+
+from settings import Config
+from brain import Brain
+from simulation import Simulation, evaluate_world
+
+# --- WIRE PROTOCOL ---
+# Every message is a frame: [type:u8][payload length:u32] + payload.
+# Genomes and fitness vectors travel as raw little-endian float64 arrays;
+# each job also carries the world's Config as JSON so workers apply the same rules.
+MSG_JOB = 1
+MSG_RESULT = 2
+MSG_STOP = 3
+MSG_HELLO = 4
+MSG_REJECT = 5
+MSG_ERROR = 6
+
+FRAME_HEADER = struct.Struct("!BI")
+JOB_HEADER = struct.Struct("!IQIIII")    # job_id, seed, n_genomes, n_opponents, genome_size, config_len
+RESULT_HEADER = struct.Struct("!II")     # job_id, n_fitness
+HELLO_HEADER = struct.Struct("!I")       # protocol version of the worker
+ERROR_HEADER = struct.Struct("!I")       # job_id, followed by a utf-8 message
+FLOAT_DTYPE = np.dtype('<f8')
+
+# Bump whenever the frame layout changes; parameters themselves travel with each job
+PROTOCOL_VERSION = 1
+
+# A job whose workers keep dying is failed instead of being handed out forever
+MAX_REQUEUES = 3
+
+# Probe idle connections so a peer that vanishes without closing (power loss, partition) is detected in ~1 min
+KEEPALIVE_IDLE = 30
+KEEPALIVE_INTERVAL = 10
+KEEPALIVE_COUNT = 3
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("connessione chiusa")
+        buf.extend(chunk)
+    return bytes(buf)
+
+def configure_socket(sock: socket.socket) -> None:
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # Per-socket keepalive tuning is not available on every platform
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE)
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+    if hasattr(socket, "TCP_KEEPCNT"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_COUNT)
+
+def send_frame(sock: socket.socket, msg_type: int, payload: bytes = b"") -> None:
+    sock.sendall(FRAME_HEADER.pack(msg_type, len(payload)) + payload)
+
+def recv_frame(sock: socket.socket) -> Tuple[int, bytes]:
+    msg_type, length = FRAME_HEADER.unpack(_recv_exact(sock, FRAME_HEADER.size))
+    return msg_type, _recv_exact(sock, length)
+
+def config_genome_size(cfg: Config) -> int:
+    return Brain.genome_size(cfg.INPUT_SIZE, cfg.HIDDEN_SIZE, cfg.OUTPUT_SIZE)
+
+def pack_genomes(brains: list, cfg: Config) -> np.ndarray:
+    if not brains:
+        return np.empty((0, config_genome_size(cfg)), dtype=FLOAT_DTYPE)
+    return np.stack([b.to_array() for b in brains]).astype(FLOAT_DTYPE)
+
+def encode_config(cfg: Config) -> bytes:
+    return json.dumps(cfg.as_dict()).encode("utf-8")
+
+def decode_config(raw: bytes) -> Config:
+    # JSON turns tuples (colors) into lists; colors are used as dict keys, so restore them
+    values = json.loads(raw.decode("utf-8"))
+    return Config(**{name: tuple(v) if isinstance(v, list) else v for name, v in values.items()})
+
+def encode_job(job_id: int, seed: int, genomes: np.ndarray, opponents: np.ndarray, cfg: Config) -> bytes:
+    raw_cfg = encode_config(cfg)
+    header = JOB_HEADER.pack(job_id, seed, len(genomes), len(opponents), config_genome_size(cfg), len(raw_cfg))
+    return header + raw_cfg + genomes.astype(FLOAT_DTYPE).tobytes() + opponents.astype(FLOAT_DTYPE).tobytes()
+
+def decode_job(payload: bytes) -> Tuple[int, int, np.ndarray, np.ndarray, Config]:
+    job_id, seed, n_genomes, n_opponents, genome_size, config_len = JOB_HEADER.unpack_from(payload)
+    cfg = decode_config(payload[JOB_HEADER.size:JOB_HEADER.size + config_len])
+    if genome_size != config_genome_size(cfg):
+        raise ValueError(f"Genome di dimensione {genome_size}, attesi {config_genome_size(cfg)} pesi")
+
+    flat = np.frombuffer(payload, dtype=FLOAT_DTYPE, offset=JOB_HEADER.size + config_len)
+    batch = flat.reshape(n_genomes + n_opponents, genome_size)
+    return job_id, seed, batch[:n_genomes], batch[n_genomes:], cfg
+
+def encode_result(job_id: int, fitness: np.ndarray) -> bytes:
+    return RESULT_HEADER.pack(job_id, len(fitness)) + fitness.astype(FLOAT_DTYPE).tobytes()
+
+def encode_error(job_id: int, message: str) -> bytes:
+    return ERROR_HEADER.pack(job_id) + message.encode("utf-8")
+
+def decode_error(payload: bytes) -> Tuple[int, str]:
+    (job_id,) = ERROR_HEADER.unpack_from(payload)
+    return job_id, payload[ERROR_HEADER.size:].decode("utf-8", errors="replace")
+
+def decode_result(payload: bytes) -> Tuple[int, np.ndarray]:
+    job_id, n = RESULT_HEADER.unpack_from(payload)
+    fitness = np.frombuffer(payload, dtype=FLOAT_DTYPE, count=n, offset=RESULT_HEADER.size)
+    return job_id, fitness.astype('float64')
+
+
+class Coordinator:
+    def __init__(self, host: str = "0.0.0.0", port: int = 5555, worlds_per_generation: int = 4, job_timeout: float = None):
+        self.host = host
+        self.port = port
+        self.worlds_per_generation = worlds_per_generation
+        # Seconds to wait for a single result before the worker is considered lost
+        self.job_timeout = job_timeout
+
+        self.server: socket.socket = None
+        self.running = False
+        self.workers = 0
+
+        self.pending: "queue.Queue[int]" = queue.Queue()
+        self.payloads: Dict[int, bytes] = {}
+        self.results: Dict[int, np.ndarray] = {}
+        self.failures: Dict[int, str] = {}
+        self.requeues: Dict[int, int] = {}
+        self.lock = threading.Lock()
+        self.done = threading.Condition(self.lock)
+        self.next_job_id = 0
+
+    def start(self) -> None:
+        self.server = socket.create_server((self.host, self.port))
+        self.port = self.server.getsockname()[1]
+        self.running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        print(f"--- Coordinatore in ascolto su {self.host}:{self.port} ---")
+
+    def stop(self) -> None:
+        self.running = False
+        if self.server is not None:
+            self.server.close()
+
+    def _accept_loop(self) -> None:
+        while self.running:
+            try:
+                conn, addr = self.server.accept()
+            except OSError:
+                break
+            configure_socket(conn)
+            threading.Thread(target=self._serve_worker, args=(conn, addr), daemon=True).start()
+
+    def _serve_worker(self, conn: socket.socket, addr: tuple) -> None:
+        name = f"{addr[0]}:{addr[1]}"
+        if not self._handshake(conn, name):
+            conn.close()
+            return
+
+        with self.lock:
+            self.workers += 1
+        print(f"Worker connesso: {name}")
+        conn.settimeout(self.job_timeout)
+
+        try:
+            while self.running:
+                try:
+                    job_id = self.pending.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                try:
+                    send_frame(conn, MSG_JOB, self.payloads[job_id])
+                    msg_type, payload = recv_frame(conn)
+                    if msg_type == MSG_ERROR:
+                        result_id, message = decode_error(payload)
+                    elif msg_type == MSG_RESULT:
+                        result_id, fitness = decode_result(payload)
+                    else:
+                        raise ValueError(f"messaggio inatteso {msg_type}")
+                    if result_id != job_id:
+                        raise ValueError(f"risultato per job {result_id}, atteso {job_id}")
+                except (OSError, ValueError, struct.error) as e:
+                    # Covers disconnects, resets, keepalive failures and job_timeout expiry (socket.timeout is an OSError)
+                    self._requeue(job_id, f"Worker perso {name}: {e}")
+                    return
+
+                with self.done:
+                    if msg_type == MSG_ERROR:
+                        # The job itself is invalid: re-queueing it would only fail on every worker
+                        print(f"Job {job_id} rifiutato da {name}: {message}")
+                        self.failures[job_id] = message
+                    else:
+                        self.results[job_id] = fitness
+                    self.done.notify_all()
+
+            try:
+                send_frame(conn, MSG_STOP)
+            except OSError:
+                pass
+        finally:
+            with self.lock:
+                self.workers -= 1
+            conn.close()
+
+    def _requeue(self, job_id: int, reason: str) -> None:
+        with self.done:
+            self.requeues[job_id] = self.requeues.get(job_id, 0) + 1
+            if self.requeues[job_id] > MAX_REQUEUES:
+                print(f"Job {job_id} abbandonato dopo {MAX_REQUEUES} tentativi ({reason})")
+                self.failures[job_id] = f"{MAX_REQUEUES + 1} worker persi, ultimo: {reason}"
+                self.done.notify_all()
+                return
+        print(f"{reason} -> job {job_id} rimesso in coda")
+        self.pending.put(job_id)
+
+    def _handshake(self, conn: socket.socket, name: str) -> bool:
+        conn.settimeout(10.0)
+        try:
+            msg_type, payload = recv_frame(conn)
+            if msg_type != MSG_HELLO:
+                raise ValueError(f"messaggio inatteso {msg_type}")
+            (version,) = HELLO_HEADER.unpack(payload)
+            if version == PROTOCOL_VERSION:
+                return True
+
+            message = f"protocollo v{version}, il coordinatore usa v{PROTOCOL_VERSION}: aggiorna distributed.py"
+            print(f"Worker rifiutato {name}: {message}")
+            send_frame(conn, MSG_REJECT, message.encode("utf-8"))
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Handshake fallito con {name}: {e}")
+        return False
+
+    def run_jobs(self, jobs: List[Tuple[int, np.ndarray, np.ndarray, Config]]) -> List[np.ndarray]:
+        job_ids = []
+        with self.lock:
+            for seed, genomes, opponents, cfg in jobs:
+                job_id = self.next_job_id
+                self.next_job_id += 1
+                self.payloads[job_id] = encode_job(job_id, seed, genomes, opponents, cfg)
+                job_ids.append(job_id)
+
+        for job_id in job_ids:
+            self.pending.put(job_id)
+
+        with self.done:
+            while not all(job_id in self.results or job_id in self.failures for job_id in job_ids):
+                if not self.done.wait(timeout=5.0) and self.workers == 0:
+                    print("In attesa di worker...")
+
+            results = [self.results.pop(job_id, None) for job_id in job_ids]
+            errors = [self.failures.pop(job_id) for job_id in job_ids if job_id in self.failures]
+            for job_id in job_ids:
+                del self.payloads[job_id]
+                self.requeues.pop(job_id, None)
+
+        if errors:
+            raise RuntimeError(f"{len(errors)} job falliti: {errors[0]}")
+        return results
+
+    def assign_fitness(self, team_green: list, team_blue: list, cfg: Config) -> None:
+        genomes = pack_genomes([a.brain for a in team_green], cfg)
+        opponents = pack_genomes([a.brain for a in team_blue], cfg)
+        seeds = [random.getrandbits(63) for _ in range(self.worlds_per_generation)]
+
+        results = self.run_jobs([(seed, genomes, opponents, cfg) for seed in seeds])
+        fitness = np.mean(results, axis=0)
+
+        for agent, fit in zip(team_green + team_blue, fitness):
+            agent.fitness = float(fit)
+
+
+def run_worker(host: str, port: int, retry_delay: float = 2.0) -> None:
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+        except OSError as e:
+            print(f"Coordinatore non raggiungibile ({e}), nuovo tentativo tra {retry_delay}s")
+            time.sleep(retry_delay)
+            continue
+
+        with sock:
+            configure_socket(sock)
+            try:
+                send_frame(sock, MSG_HELLO, HELLO_HEADER.pack(PROTOCOL_VERSION))
+                while True:
+                    msg_type, payload = recv_frame(sock)
+                    if msg_type == MSG_STOP:
+                        return
+                    if msg_type == MSG_REJECT:
+                        print(f"Rifiutato dal coordinatore: {payload.decode('utf-8', errors='replace')}")
+                        return
+
+                    (job_id,) = struct.unpack_from("!I", payload)
+                    try:
+                        _, seed, genomes, opponents, cfg = decode_job(payload)
+                        brains_green = [Brain.from_array(g, cfg.INPUT_SIZE, cfg.HIDDEN_SIZE, cfg.OUTPUT_SIZE) for g in genomes]
+                        brains_blue = [Brain.from_array(g, cfg.INPUT_SIZE, cfg.HIDDEN_SIZE, cfg.OUTPUT_SIZE) for g in opponents]
+
+                        fit_green, fit_blue = evaluate_world(brains_green, brains_blue, seed, cfg)
+                        result = encode_result(job_id, np.concatenate([fit_green, fit_blue]))
+                    except Exception as e:
+                        # A broken job is reported back; only socket errors below mean the coordinator is gone
+                        print(f"Job {job_id} fallito: {type(e).__name__}: {e}")
+                        send_frame(sock, MSG_ERROR, encode_error(job_id, f"{type(e).__name__}: {e}"))
+                        continue
+
+                    send_frame(sock, MSG_RESULT, result)
+            except (OSError, struct.error) as e:
+                print(f"Connessione al coordinatore persa ({e})")
+        time.sleep(retry_delay)
+
+def spawn_local_workers(count: int, port: int, host: str = "127.0.0.1") -> List[multiprocessing.Process]:
+    # "spawn" so children don't inherit the listening socket and accepted connections of the coordinator
+    ctx = multiprocessing.get_context("spawn")
+    workers = []
+    for _ in range(count):
+        p = ctx.Process(target=run_worker, args=(host, port), daemon=True)
+        p.start()
+        workers.append(p)
+    return workers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valutazione distribuita delle generazioni")
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    p_coord = sub.add_parser("coordinator")
+    p_coord.add_argument("--host", default="0.0.0.0")
+    p_coord.add_argument("--port", type=int, default=5555)
+    p_coord.add_argument("--generations", type=int, default=100)
+    p_coord.add_argument("--worlds", type=int, default=4, help="mondi (seed) valutati per generazione")
+    p_coord.add_argument("--job-timeout", type=float, default=None,
+                         help="secondi massimi per un job (i worker irraggiungibili sono comunque rilevati via TCP keepalive)")
+    p_coord.add_argument("--local-workers", type=int, default=0)
+    p_coord.add_argument("--checkpoint", default="distributed_checkpoint.pkl",
+                         help="ripreso se esiste e salvato a ogni generazione")
+
+    p_worker = sub.add_parser("worker")
+    p_worker.add_argument("--host", default="127.0.0.1")
+    p_worker.add_argument("--port", type=int, default=5555)
+
+    args = parser.parse_args()
+
+    if args.role == "worker":
+        run_worker(args.host, args.port)
+    else:
+        coord = Coordinator(args.host, args.port, args.worlds, args.job_timeout)
+        coord.start()
+        spawn_local_workers(args.local_workers, coord.port)
+
+        sim = Simulation(headless=True, evaluator=coord)
+        if os.path.exists(args.checkpoint):
+            sim.load_simulation(args.checkpoint)
+        try:
+            for _ in range(args.generations):
+                sim.next_generation()
+                sim.save_simulation(args.checkpoint)
+        finally:
+            coord.stop()
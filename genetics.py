@@ -2,10 +2,10 @@ import numpy as np
 import copy
 import random
 from typing import List
-import settings as c
+from settings import Config, DEFAULT_CONFIG
 from brain import Brain
 
-def evolve_population(agents: List) -> List[Brain]:
+def evolve_population(agents: List, cfg: Config = DEFAULT_CONFIG) -> List[Brain]:
     ELITISM_COUNT = 2
     TOURNAMENT_SIZE = 3
     
@@ -19,8 +19,8 @@ def evolve_population(agents: List) -> List[Brain]:
         parent1 = tournament_selection(agents, size=TOURNAMENT_SIZE)
         parent2 = tournament_selection(agents, size=TOURNAMENT_SIZE)
         
-        child_brain = crossover(parent1.brain, parent2.brain)
-        mutate_brain(child_brain)
+        child_brain = crossover(parent1.brain, parent2.brain, cfg)
+        mutate_brain(child_brain, cfg)
         
         new_brains.append(child_brain)
         
@@ -30,8 +30,8 @@ def tournament_selection(population: List, size: int = 3):
     tournament = random.sample(population, size)
     return max(tournament, key=lambda x: x.fitness)
 
-def crossover(brain1: Brain, brain2: Brain) -> Brain:
-    child = Brain(c.INPUT_SIZE, c.HIDDEN_SIZE, c.OUTPUT_SIZE)
+def crossover(brain1: Brain, brain2: Brain, cfg: Config = DEFAULT_CONFIG) -> Brain:
+    child = Brain(cfg.INPUT_SIZE, cfg.HIDDEN_SIZE, cfg.OUTPUT_SIZE)
     alpha = random.uniform(0.0, 1.0)
     
     def blend(mat1, mat2):
@@ -48,14 +48,14 @@ def crossover(brain1: Brain, brain2: Brain) -> Brain:
     
     return child
 
-def mutate_brain(brain: Brain) -> None:
+def mutate_brain(brain: Brain, cfg: Config = DEFAULT_CONFIG) -> None:
     def mutate_matrix(mat):
-        mask_fine = np.random.rand(*mat.shape) < c.MUTATION_RATE 
-        noise_fine = np.random.randn(*mat.shape) * (c.MUTATION_STRENGTH * 0.5) 
+        mask_fine = np.random.rand(*mat.shape) < cfg.MUTATION_RATE 
+        noise_fine = np.random.randn(*mat.shape) * (cfg.MUTATION_STRENGTH * 0.5) 
         mat[mask_fine] += noise_fine[mask_fine]
         
-        mask_shock = np.random.rand(*mat.shape) < (c.MUTATION_RATE * 0.1)
-        noise_shock = np.random.randn(*mat.shape) * (c.MUTATION_STRENGTH * 5.0)
+        mask_shock = np.random.rand(*mat.shape) < (cfg.MUTATION_RATE * 0.1)
+        noise_shock = np.random.randn(*mat.shape) * (cfg.MUTATION_STRENGTH * 5.0)
         mat[mask_shock] += noise_shock[mask_shock]
 
     mutate_matrix(brain.w1); mutate_matrix(brain.b1)
@@ -1,14 +1,14 @@
 import pygame
 import random
-import settings as c
+from settings import Config, DEFAULT_CONFIG
 
 class Resource:
-    def __init__(self):
-        self.x = random.uniform(10, c.WIDTH - 10)
-        self.y = random.uniform(10, c.HEIGHT - 10)
+    def __init__(self, cfg: Config = DEFAULT_CONFIG):
+        self.x = random.uniform(10, cfg.WIDTH - 10)
+        self.y = random.uniform(10, cfg.HEIGHT - 10)
         self.pos = (self.x, self.y)
         self.radius = 5
-        self.color = c.YELLOW
+        self.color = cfg.YELLOW
         self.active = True
 
     def draw(self, screen: pygame.Surface) -> None:
@@ -54,4 +54,26 @@ FRIENDLY_FIRE_PENALTY = -1
 # --- GENETICS ---
 EPOCH_DURATION = 30 * 60
 MUTATION_RATE = 0.05
-MUTATION_STRENGTH = 0.5
\ No newline at end of file
+MUTATION_STRENGTH = 0.5
+
+DEFAULTS = {name: value for name, value in dict(globals()).items() if name.isupper()}
+
+# Fixed by Agent.get_state (17 sensors) and Agent.update (thrust, turn, attack)
+FIXED_PARAMS = ("INPUT_SIZE", "OUTPUT_SIZE")
+
+# Per-world view of the constants above, so several worlds can run with different values
+class Config:
+    def __init__(self, **overrides):
+        for name, value in DEFAULTS.items():
+            setattr(self, name, value)
+        for name, value in overrides.items():
+            if name not in DEFAULTS:
+                raise KeyError(f"Parametro sconosciuto: {name}")
+            if name in FIXED_PARAMS and value != DEFAULTS[name]:
+                raise ValueError(f"{name} è fissato dai sensori/azioni dell'agente e non può essere modificato")
+            setattr(self, name, value)
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+DEFAULT_CONFIG = Config()
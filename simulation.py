@@ -7,62 +7,69 @@ from typing import List, Dict, Tuple
 
 from agent import Agent
 from resource import Resource
-import settings as s
+from settings import Config
 import genetics as gen
 
 class Simulation:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((s.WIDTH, s.HEIGHT))
-        self.clock = pygame.time.Clock()
+    def __init__(self, cfg: Config = None, headless: bool = False, evaluator=None):
+        self.cfg = cfg if cfg is not None else Config()
+        self.headless = headless
+        # Optional remote evaluator (see distributed.Coordinator) used in place of the local epoch fitness
+        self.evaluator = evaluator
         self.running = True
         self.fast_mode = False
-        
-        self.font_ui = pygame.font.SysFont("Consolas", 18)
-        self.font_loot = pygame.font.SysFont("Arial", 30, bold=True)
-        self.font_info = pygame.font.SysFont("Arial", 18)
+
+        if not headless:
+            pygame.init()
+            self.screen = pygame.display.set_mode((self.cfg.WIDTH, self.cfg.HEIGHT))
+            self.clock = pygame.time.Clock()
+
+            self.font_ui = pygame.font.SysFont("Consolas", 18)
+            self.font_loot = pygame.font.SysFont("Arial", 30, bold=True)
+            self.font_info = pygame.font.SysFont("Arial", 18)
 
         self.agents: List[Agent] = []
         self.resources: List[Resource] = []
         self.stockpiles: Dict[Tuple[int, int, int], int] = {
-            s.GREEN: 0,
-            s.BLUE: 0
+            self.cfg.GREEN: 0,
+            self.cfg.BLUE: 0
         }
 
         self.generation = 1
         self.frame_count = 0
+        self.fitness_history: List[Tuple[float, float]] = []
         
         self.init_agents()
         self.init_resources()
 
     def init_agents(self) -> None:
         teams_config = [
-            {"color": s.GREEN, "res_color": s.ORANGE, "base": (100, s.HEIGHT // 2)},
-            {"color": s.BLUE, "res_color": s.LIGHT_BLUE, "base": (s.WIDTH - 100, s.HEIGHT // 2)}
+            {"color": self.cfg.GREEN, "res_color": self.cfg.ORANGE, "base": (100, self.cfg.HEIGHT // 2)},
+            {"color": self.cfg.BLUE, "res_color": self.cfg.LIGHT_BLUE, "base": (self.cfg.WIDTH - 100, self.cfg.HEIGHT // 2)}
         ]
 
         for config in teams_config:
             base_pos = config["base"]
-            for _ in range(s.NUM_AGENTS // 2):
+            for _ in range(self.cfg.NUM_AGENTS // 2):
                 spawn_x = base_pos[0] + random.uniform(-40, 40)
                 spawn_y = base_pos[1] + random.uniform(-40, 40)
-                self.agents.append(Agent(spawn_x, spawn_y, config["color"], config["res_color"], base_pos))
+                self.agents.append(Agent(spawn_x, spawn_y, config["color"], config["res_color"], base_pos, self.cfg))
 
     def init_resources(self) -> None:
-        self.resources = [Resource() for _ in range(s.NUM_RESOURCES)]
+        self.resources = [Resource(self.cfg) for _ in range(self.cfg.NUM_RESOURCES)]
 
     def check_collisions(self) -> None:
         for agent in self.agents:
             if agent.carrying_resource:
                 dist_to_base = np.linalg.norm(agent.pos - agent.base_pos)
-                if dist_to_base < (s.SAFE_ZONE_BASE_RADIUS + s.AGENT_RADIUS):
+                if dist_to_base < (self.cfg.SAFE_ZONE_BASE_RADIUS + self.cfg.AGENT_RADIUS):
                     self.handle_deposit(agent)
                 continue
 
             for res in self.resources:
                 if res.active:
                     dist = np.linalg.norm(agent.pos - np.array(res.pos))
-                    if dist < (s.AGENT_RADIUS + res.radius):
+                    if dist < (self.cfg.AGENT_RADIUS + res.radius):
                         res.active = False
                         agent.carrying_resource = True
                         agent.color = agent.color_resource
@@ -75,29 +82,29 @@ class Simulation:
         agent.reward_deposit()
 
     def check_raids(self) -> None:
-        base_green_pos = np.array((100, s.HEIGHT // 2))
-        base_blue_pos = np.array((s.WIDTH - 100, s.HEIGHT // 2))
+        base_green_pos = np.array((100, self.cfg.HEIGHT // 2))
+        base_blue_pos = np.array((self.cfg.WIDTH - 100, self.cfg.HEIGHT // 2))
 
         for agent in self.agents:
             if not agent.active or agent.carrying_resource:
                 continue
 
-            enemy_team = s.BLUE if agent.team == s.GREEN else s.GREEN
-            target_base_pos = base_blue_pos if agent.team == s.GREEN else base_green_pos
+            enemy_team = self.cfg.BLUE if agent.team == self.cfg.GREEN else self.cfg.GREEN
+            target_base_pos = base_blue_pos if agent.team == self.cfg.GREEN else base_green_pos
             
             dist = np.linalg.norm(agent.pos - target_base_pos)
 
-            if dist < s.SAFE_ZONE_BASE_RADIUS and self.stockpiles[enemy_team] > 0:
+            if dist < self.cfg.SAFE_ZONE_BASE_RADIUS and self.stockpiles[enemy_team] > 0:
                 self.stockpiles[enemy_team] -= 1
                 agent.carrying_resource = True
                 agent.color = agent.color_resource
-                agent.fitness += s.RAID_REWARD
+                agent.fitness += self.cfg.RAID_REWARD
                 agent.raids_successful += 1
-                agent.energy = min(agent.energy + 50.0, s.INITIAL_ENERGY)
+                agent.energy = min(agent.energy + 50.0, self.cfg.INITIAL_ENERGY)
 
     def resolve_agent_collisions(self) -> None:
         n = len(self.agents)
-        min_dist_sq = (s.AGENT_RADIUS * 2) ** 2
+        min_dist_sq = (self.cfg.AGENT_RADIUS * 2) ** 2
         
         for i in range(n):
             a1 = self.agents[i]
@@ -112,7 +119,7 @@ class Simulation:
 
                 if 0 < dist_sq < min_dist_sq:
                     dist = np.sqrt(dist_sq)
-                    overlap = (s.AGENT_RADIUS * 2) - dist
+                    overlap = (self.cfg.AGENT_RADIUS * 2) - dist
                     correction = (delta / dist) * (overlap * 0.5)
                     
                     a1.pos += correction
@@ -120,17 +127,17 @@ class Simulation:
 
     def update(self) -> None:
         self.frame_count += 1
-        if self.frame_count >= s.EPOCH_DURATION:
+        if self.frame_count >= self.cfg.EPOCH_DURATION:
             self.next_generation()
             return
 
-        team_green = [a for a in self.agents if a.team == s.GREEN and a.active]
-        team_blue = [a for a in self.agents if a.team == s.BLUE and a.active]
+        team_green = [a for a in self.agents if a.team == self.cfg.GREEN and a.active]
+        team_blue = [a for a in self.agents if a.team == self.cfg.BLUE and a.active]
 
         for agent in self.agents:
             if not agent.active: continue
             
-            enemies = team_blue if agent.team == s.GREEN else team_green
+            enemies = team_blue if agent.team == self.cfg.GREEN else team_green
             neighbors = [a for a in self.agents if a is not agent and a.active]
             
             agent.update(self.resources, enemies, neighbors)
@@ -142,42 +149,46 @@ class Simulation:
 
     def respawn_resources(self) -> None:
         self.resources = [r for r in self.resources if r.active]
-        if len(self.resources) < s.NUM_RESOURCES:
-            if random.random() < s.RESOURCE_RESPAWN_RATE:
-                self.resources.append(Resource())
+        if len(self.resources) < self.cfg.NUM_RESOURCES:
+            if random.random() < self.cfg.RESOURCE_RESPAWN_RATE:
+                self.resources.append(Resource(self.cfg))
 
     def next_generation(self) -> None:
         print(f"--- FINE GENERAZIONE {self.generation} ---")
         
-        team_green = [a for a in self.agents if a.team == s.GREEN]
-        team_blue = [a for a in self.agents if a.team == s.BLUE]
+        team_green = [a for a in self.agents if a.team == self.cfg.GREEN]
+        team_blue = [a for a in self.agents if a.team == self.cfg.BLUE]
+
+        if self.evaluator is not None:
+            self.evaluator.assign_fitness(team_green, team_blue, self.cfg)
         
         avg_fit_g = np.mean([a.fitness for a in team_green]) if team_green else 0
         avg_fit_b = np.mean([a.fitness for a in team_blue]) if team_blue else 0
         print(f"Fitness Media -> VERDI: {avg_fit_g:.2f} | BLU: {avg_fit_b:.2f}")
+        self.fitness_history.append((float(avg_fit_g), float(avg_fit_b)))
 
-        brains_green = gen.evolve_population(team_green)
-        brains_blue = gen.evolve_population(team_blue)
+        brains_green = gen.evolve_population(team_green, self.cfg)
+        brains_blue = gen.evolve_population(team_blue, self.cfg)
         
         self.agents.clear()
         self.resources.clear()
         
-        base_green_pos = (100, s.HEIGHT // 2)
-        base_blue_pos = (s.WIDTH - 100, s.HEIGHT // 2)
+        base_green_pos = (100, self.cfg.HEIGHT // 2)
+        base_blue_pos = (self.cfg.WIDTH - 100, self.cfg.HEIGHT // 2)
         
-        self.repopulate(brains_green, s.GREEN, s.ORANGE, base_green_pos)
-        self.repopulate(brains_blue, s.BLUE, s.LIGHT_BLUE, base_blue_pos)
+        self.repopulate(brains_green, self.cfg.GREEN, self.cfg.ORANGE, base_green_pos)
+        self.repopulate(brains_blue, self.cfg.BLUE, self.cfg.LIGHT_BLUE, base_blue_pos)
         
         self.init_resources()
         self.frame_count = 0
         self.generation += 1
-        self.stockpiles = {s.GREEN: 0, s.BLUE: 0}
+        self.stockpiles = {self.cfg.GREEN: 0, self.cfg.BLUE: 0}
 
     def repopulate(self, brains: list, team_color, res_color, base_pos) -> None:
         for brain in brains:
             spawn_x = base_pos[0] + random.uniform(-40, 40)
             spawn_y = base_pos[1] + random.uniform(-40, 40)
-            new_agent = Agent(spawn_x, spawn_y, team_color, res_color, base_pos)
+            new_agent = Agent(spawn_x, spawn_y, team_color, res_color, base_pos, self.cfg)
             new_agent.brain = brain
             self.agents.append(new_agent)
 
@@ -192,7 +203,7 @@ class Simulation:
             "[ESC] Esci"
         ]
         
-        start_x, start_y = 10, s.HEIGHT - 150
+        start_x, start_y = 10, self.cfg.HEIGHT - 150
         line_height = 18
         padding = 5
         
@@ -209,18 +220,18 @@ class Simulation:
             self.screen.blit(text_surf, (start_x, start_y + i * line_height))
 
     def draw(self) -> None:
-        self.screen.fill(s.WHITE)
+        self.screen.fill(self.cfg.WHITE)
         
-        base_green = (100, s.HEIGHT // 2)
-        base_blue = (s.WIDTH - 100, s.HEIGHT // 2)
+        base_green = (100, self.cfg.HEIGHT // 2)
+        base_blue = (self.cfg.WIDTH - 100, self.cfg.HEIGHT // 2)
         
-        pygame.draw.circle(self.screen, (200, 200, 200), base_green, s.SAFE_ZONE_BASE_RADIUS, 1)
-        pygame.draw.circle(self.screen, (200, 200, 200), base_blue, s.SAFE_ZONE_BASE_RADIUS, 1)
+        pygame.draw.circle(self.screen, (200, 200, 200), base_green, self.cfg.SAFE_ZONE_BASE_RADIUS, 1)
+        pygame.draw.circle(self.screen, (200, 200, 200), base_blue, self.cfg.SAFE_ZONE_BASE_RADIUS, 1)
         
-        text_g = self.font_loot.render(str(self.stockpiles[s.GREEN]), True, s.GREEN)
+        text_g = self.font_loot.render(str(self.stockpiles[self.cfg.GREEN]), True, self.cfg.GREEN)
         self.screen.blit(text_g, (base_green[0] - 10, base_green[1] - 15))
         
-        text_b = self.font_loot.render(str(self.stockpiles[s.BLUE]), True, s.BLUE)
+        text_b = self.font_loot.render(str(self.stockpiles[self.cfg.BLUE]), True, self.cfg.BLUE)
         self.screen.blit(text_b, (base_blue[0] - 10, base_blue[1] - 15))
 
         for res in self.resources:
@@ -229,14 +240,14 @@ class Simulation:
         for agent in self.agents:
             agent.draw(self.screen)
 
-        info_text = f"Gen: {self.generation} | Frame: {self.frame_count}/{s.EPOCH_DURATION}"
+        info_text = f"Gen: {self.generation} | Frame: {self.frame_count}/{self.cfg.EPOCH_DURATION}"
         self.screen.blit(self.font_info.render(info_text, True, (0, 0, 0)), (10, 10))
         
         self.draw_controls_gui()
         
         if self.fast_mode:
             turbo_text = self.font_ui.render(">>> TURBO MODE <<<", True, (255, 0, 0))
-            self.screen.blit(turbo_text, (s.WIDTH // 2 - 80, 10))
+            self.screen.blit(turbo_text, (self.cfg.WIDTH // 2 - 80, 10))
             
         pygame.display.flip()
 
@@ -274,8 +285,10 @@ class Simulation:
             self.generation = state['generation']
             self.frame_count = state['frame_count']
             self.agents = state['agents']
+            for agent in self.agents:
+                agent.cfg = self.cfg
             self.resources = state['resources']
-            self.stockpiles = state.get('stockpiles', {s.GREEN: 0, s.BLUE: 0})
+            self.stockpiles = state.get('stockpiles', {self.cfg.GREEN: 0, self.cfg.BLUE: 0})
             print(f"--- Caricato stato Gen {self.generation} ---")
         except Exception as e:
             print(f"Errore caricamento: {e}")
@@ -283,12 +296,40 @@ class Simulation:
     def run(self) -> None:
         while self.running:
             self.events()
-            loops = s.STEP_PER_FRAME_TURBO if self.fast_mode else s.STEP_PER_FRAME
+            loops = self.cfg.STEP_PER_FRAME_TURBO if self.fast_mode else self.cfg.STEP_PER_FRAME
             for _ in range(loops):
                 self.update()
             self.draw()
             if not self.fast_mode:
-                self.clock.tick(s.FPS)
+                self.clock.tick(self.cfg.FPS)
+
+    def run_headless(self, generations: int) -> None:
+        target = self.generation + generations
+        while self.generation < target:
+            self.update()
+
+def evaluate_world(brains_green: list, brains_blue: list, seed: int, cfg: Config = None) -> Tuple[np.ndarray, np.ndarray]:
+    # Seed the global generators for reproducibility, then give the caller back its own random stream
+    py_state, np_state = random.getstate(), np.random.get_state()
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+
+    try:
+        sim = Simulation(cfg, headless=True)
+        sim.agents.clear()
+        sim.repopulate(brains_green, sim.cfg.GREEN, sim.cfg.ORANGE, (100, sim.cfg.HEIGHT // 2))
+        sim.repopulate(brains_blue, sim.cfg.BLUE, sim.cfg.LIGHT_BLUE, (sim.cfg.WIDTH - 100, sim.cfg.HEIGHT // 2))
+
+        # Stop one frame short of EPOCH_DURATION so update() never triggers next_generation
+        while sim.frame_count < sim.cfg.EPOCH_DURATION - 1:
+            sim.update()
+    finally:
+        random.setstate(py_state)
+        np.random.set_state(np_state)
+
+    fit_green = np.array([a.fitness for a in sim.agents if a.team == sim.cfg.GREEN], dtype='float64')
+    fit_blue = np.array([a.fitness for a in sim.agents if a.team == sim.cfg.BLUE], dtype='float64')
+    return fit_green, fit_blue
 
 if __name__ == "__main__":
     sim = Simulation()
@@ -0,0 +1,172 @@
+import os
+import ast
+import csv
+import json
+import time
+import random
+import hashlib
+import argparse
+import itertools
+import multiprocessing
+import numpy as np
+from typing import List, Dict
+
+from settings import Config, DEFAULTS, FIXED_PARAMS
+from simulation import Simulation
+
+SUMMARY_FIELDS = ["run_id", "params", "seed", "generations", "final_fitness", "avg_fitness", "steps_per_sec", "wall_time"]
+
+
+def parse_value(text: str):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+def parse_spec(items: List[str]) -> Dict[str, tuple]:
+    # NAME=a,b,c -> ("choice", [a, b, c]) ; NAME=lo:hi -> ("range", lo, hi)
+    spec = {}
+    for item in items:
+        name, sep, values = item.partition("=")
+        if not sep:
+            raise ValueError(f"Parametro non valido '{item}', atteso NOME=valori")
+        if name not in DEFAULTS:
+            raise KeyError(f"Parametro sconosciuto: {name}")
+        if name in FIXED_PARAMS:
+            raise ValueError(f"{name} è fissato dai sensori/azioni dell'agente e non può essere variato")
+
+        if ":" in values:
+            lo, hi = values.split(":", 1)
+            spec[name] = ("range", parse_value(lo), parse_value(hi))
+        else:
+            spec[name] = ("choice", [parse_value(v) for v in values.split(",")])
+    return spec
+
+def grid_configs(spec: Dict[str, tuple]) -> List[Dict]:
+    for name, entry in spec.items():
+        if entry[0] != "choice":
+            raise ValueError(f"La ricerca a griglia richiede una lista di valori per {name}")
+
+    names = list(spec)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(spec[n][1] for n in names))]
+
+def random_configs(spec: Dict[str, tuple], count: int, rng: random.Random) -> List[Dict]:
+    configs = []
+    for _ in range(count):
+        params = {}
+        for name, entry in spec.items():
+            if entry[0] == "choice":
+                params[name] = rng.choice(entry[1])
+            elif isinstance(entry[1], int) and isinstance(entry[2], int):
+                params[name] = rng.randint(entry[1], entry[2])
+            else:
+                params[name] = rng.uniform(entry[1], entry[2])
+        configs.append(params)
+    return configs
+
+def run_id(params: Dict, seed: int, generations: int) -> str:
+    key = json.dumps({"params": params, "seed": seed, "generations": generations}, sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+def run_config(params: Dict, seed: int, generations: int) -> Dict:
+    if generations < 1:
+        raise ValueError(f"Serve almeno 1 generazione, ricevute {generations}")
+
+    random.seed(seed)
+    np.random.seed(seed)
+
+    sim = Simulation(Config(**params), headless=True)
+    start = time.perf_counter()
+    sim.run_headless(generations)
+    wall_time = time.perf_counter() - start
+
+    per_gen = [(g + b) / 2 for g, b in sim.fitness_history]
+    return {
+        "run_id": run_id(params, seed, generations),
+        "params": json.dumps(params, sort_keys=True),
+        "seed": seed,
+        "generations": generations,
+        "final_fitness": round(per_gen[-1], 3),
+        "avg_fitness": round(float(np.mean(per_gen)), 3),
+        "steps_per_sec": round(generations * sim.cfg.EPOCH_DURATION / wall_time, 1),
+        "wall_time": round(wall_time, 2)
+    }
+
+def _run_job(job: tuple) -> tuple:
+    # Errors are returned, not raised, so one bad configuration doesn't stop imap_unordered
+    params, seed, generations = job
+    try:
+        return params, run_config(params, seed, generations), None
+    except Exception as e:
+        return params, None, str(e)
+
+def load_completed(path: str) -> Dict[str, Dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline="") as f:
+        return {row["run_id"]: row for row in csv.DictReader(f)}
+
+def run_sweep(configs: List[Dict], out_path: str, generations: int, seed: int, max_workers: int) -> List[Dict]:
+    completed = load_completed(out_path)
+    todo = list({run_id(p, seed, generations): p for p in configs if run_id(p, seed, generations) not in completed}.values())
+    print(f"--- Sweep: {len(configs)} configurazioni, {len(todo)} da eseguire ---")
+
+    new_file = not os.path.exists(out_path)
+    pool = multiprocessing.Pool(max_workers)
+    try:
+        with open(out_path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            if new_file:
+                writer.writeheader()
+
+            for params, row, error in pool.imap_unordered(_run_job, [(p, seed, generations) for p in todo]):
+                if error is not None:
+                    print(f"Errore configurazione {params}: {error}")
+                    continue
+                # One row per finished run, flushed immediately so an interrupted sweep can resume
+                writer.writerow(row)
+                f.flush()
+                completed[row["run_id"]] = row
+                print(f"Completata {row['params']} -> finale {row['final_fitness']} | media {row['avg_fitness']}")
+    except KeyboardInterrupt:
+        # Kill running and queued runs right away; finished ones are already in the CSV
+        pool.terminate()
+        pool.join()
+        print(f"--- Sweep interrotto: risultati salvati in {out_path}, rilancia per riprendere ---")
+        raise
+    pool.close()
+    pool.join()
+
+    ids = dict.fromkeys(run_id(p, seed, generations) for p in configs)
+    return [completed[i] for i in ids if i in completed]
+
+def print_summary(rows: List[Dict]) -> None:
+    rows = sorted(rows, key=lambda r: float(r["final_fitness"]), reverse=True)
+    header = f"{'final':>10} {'avg':>10} {'steps/s':>10}  params"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{float(r['final_fitness']):>10.2f} {float(r['avg_fitness']):>10.2f} {float(r['steps_per_sec']):>10.1f}  {r['params']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep di parametri su settings.py")
+    parser.add_argument("params", nargs="+", help="NOME=a,b,c (lista) oppure NOME=min:max (intervallo, solo --random)")
+    parser.add_argument("--random", type=int, default=0, help="numero di configurazioni casuali (0 = griglia)")
+    parser.add_argument("--generations", type=int, default=10,
+                        help="generazioni per configurazione; i parametri genetici (es. MUTATION_RATE) influiscono solo da 2 in su")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="sweep_results.csv")
+    args = parser.parse_args()
+    if args.generations < 1:
+        parser.error("--generations deve essere almeno 1")
+
+    spec = parse_spec(args.params)
+    if args.random:
+        configs = random_configs(spec, args.random, random.Random(args.seed))
+    else:
+        configs = grid_configs(spec)
+
+    rows = run_sweep(configs, args.out, args.generations, args.seed, args.jobs)
+    print_summary(rows)
@@ -0,0 +1,112 @@
+import socket
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import distributed as d
+from settings import Config
+from simulation import Simulation, evaluate_world
+
+# Short epochs keep every world evaluation well under a second
+CFG = Config(EPOCH_DURATION=10)
+
+
+def team_brains(cfg: Config) -> tuple:
+    sim = Simulation(cfg, headless=True)
+    green = [a.brain for a in sim.agents if a.team == cfg.GREEN]
+    blue = [a.brain for a in sim.agents if a.team == cfg.BLUE]
+    return green, blue
+
+def connect_fake_worker(port: int) -> socket.socket:
+    sock = socket.create_connection(("127.0.0.1", port))
+    d.send_frame(sock, d.MSG_HELLO, d.HELLO_HEADER.pack(d.PROTOCOL_VERSION))
+    return sock
+
+
+class TestWireFormat(unittest.TestCase):
+    def test_job_and_result_round_trip(self):
+        cfg = Config(EPOCH_DURATION=10, HIDDEN_SIZE=8, FOV_RADIUS=150.0)
+        green, blue = team_brains(cfg)
+        genomes, opponents = d.pack_genomes(green, cfg), d.pack_genomes(blue, cfg)
+
+        job_id, seed, g, o, decoded = d.decode_job(d.encode_job(7, 2 ** 40, genomes, opponents, cfg))
+        self.assertEqual((job_id, seed), (7, 2 ** 40))
+        np.testing.assert_array_equal(g, genomes)
+        np.testing.assert_array_equal(o, opponents)
+        self.assertEqual(decoded.as_dict(), cfg.as_dict())
+
+        fitness = np.array([1.5, -2.0, 3.25])
+        result_id, decoded_fitness = d.decode_result(d.encode_result(7, fitness))
+        self.assertEqual(result_id, 7)
+        np.testing.assert_array_equal(decoded_fitness, fitness)
+
+
+class TestCoordinator(unittest.TestCase):
+    def setUp(self):
+        self.coord = d.Coordinator("127.0.0.1", 0)
+        self.coord.start()
+        self.processes = []
+        self.sockets = []
+        self.runner = ThreadPoolExecutor(max_workers=1)
+
+    def tearDown(self):
+        self.coord.stop()
+        for sock in self.sockets:
+            sock.close()
+        for p in self.processes:
+            p.terminate()
+            p.join()
+        self.runner.shutdown(wait=False)
+
+    def submit(self, cfg: Config, seed: int = 3):
+        green, blue = team_brains(cfg)
+        job = (seed, d.pack_genomes(green, cfg), d.pack_genomes(blue, cfg), cfg)
+        return green, blue, self.runner.submit(self.coord.run_jobs, [job])
+
+    def kill_fake_worker_mid_job(self) -> None:
+        sock = connect_fake_worker(self.coord.port)
+        self.sockets.append(sock)
+        msg_type, _ = d.recv_frame(sock)
+        self.assertEqual(msg_type, d.MSG_JOB)
+        sock.close()
+
+    def test_job_requeued_after_worker_dies(self):
+        green, blue, future = self.submit(CFG)
+        self.kill_fake_worker_mid_job()
+
+        self.processes += d.spawn_local_workers(1, self.coord.port)
+        (fitness,) = future.result(timeout=120)
+        np.testing.assert_allclose(fitness, np.concatenate(evaluate_world(green, blue, 3, CFG)))
+
+    def test_failing_job_raises_and_worker_survives(self):
+        # A string radius breaks the world only once it runs, not when the job is decoded
+        _, _, future = self.submit(Config(EPOCH_DURATION=10, FOV_RADIUS="abc"))
+        self.processes += d.spawn_local_workers(1, self.coord.port)
+
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=120)
+        self.assertTrue(self.processes[0].is_alive())
+
+        # The same worker keeps serving valid jobs
+        _, _, future = self.submit(CFG)
+        self.assertEqual(len(future.result(timeout=120)), 1)
+
+    def test_job_abandoned_after_max_requeues(self):
+        _, _, future = self.submit(CFG)
+        for _ in range(d.MAX_REQUEUES + 1):
+            self.kill_fake_worker_mid_job()
+
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=30)
+
+    def test_handshake_rejects_other_protocol_version(self):
+        sock = socket.create_connection(("127.0.0.1", self.coord.port))
+        self.sockets.append(sock)
+        d.send_frame(sock, d.MSG_HELLO, d.HELLO_HEADER.pack(d.PROTOCOL_VERSION + 1))
+        msg_type, _ = d.recv_frame(sock)
+        self.assertEqual(msg_type, d.MSG_REJECT)
+
+
+if __name__ == "__main__":
+    unittest.main()